@@ -5,25 +5,113 @@ Checks if multi-drone training worked properly
 """
 
 import os
-import glob
 import json
 import csv
+import mmap
+import re
+from collections import Counter
 from datetime import datetime
 
+# Everything we look for in a training log, matched in a single pass.
+# Agent names and behavior_spec are case-sensitive, spawning words are not.
+LOG_INDICATORS = re.compile(
+    rb"(?P<agent_0>DroneAgent_0)|(?P<agent_1>DroneAgent_1)|(?P<behavior_spec>behavior_spec)"
+    rb"|(?P<agents>(?i:agents))|(?P<spawned>(?i:spawned))"
+)
+
+# Multi-drone runs this tool knows about
+MULTI_DRONE_RUNS = ["multi_drone_path_v1", "multi_drone_path_v2"]
+
+# Parsed indicator counts, keyed by log path and invalidated by mtime/size
+ANALYSIS_CACHE_FILE = os.path.join("results", ".analysis_cache.json")
+
+def scan_agent_dir(agent_dir):
+    """One pass over a DroneAgent dir - (found, model files with mtime/size, TensorBoard logs)"""
+    model_files = []
+    tb_files = []
+    try:
+        it = os.scandir(agent_dir)
+    except OSError:
+        return False, model_files, tb_files
+    
+    with it:
+        for entry in it:
+            name = entry.name
+            if name.startswith('.'):
+                continue  # glob skipped hidden files too
+            if name.endswith(('.onnx', '.pt')):
+                st = entry.stat()
+                model_files.append((entry.path, st.st_mtime, st.st_size))
+            elif name.startswith('events.out.tfevents.'):
+                tb_files.append(entry.path)
+    return True, model_files, tb_files
+
+def find_result_dirs():
+    """Which of the multi-drone runs exist, from a single read of results/"""
+    with os.scandir("results") as it:
+        present = {entry.name for entry in it if entry.is_dir()}
+    return [f"results/{name}" for name in MULTI_DRONE_RUNS if name in present]
+
+def scan_log_files(run_logs_dir):
+    """Find *.log files in run_logs along with their stat result (None if there's no run_logs)"""
+    try:
+        it = os.scandir(run_logs_dir)
+    except OSError:
+        return None
+    with it:
+        return [(entry.path, entry.stat()) for entry in it
+                if entry.name.endswith('.log') and not entry.name.startswith('.')]
+
+def scan_log_indicators(log_path, size):
+    """Count every multi-drone indicator in one pass over the mmap'd log bytes"""
+    counts = Counter()
+    if size == 0:
+        return counts  # can't mmap an empty file
+    with open(log_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for match in LOG_INDICATORS.finditer(mm):
+            counts[match.lastgroup] += 1
+    return counts
+
+def load_analysis_cache():
+    """Load cached log scan results (empty if missing or broken)"""
+    try:
+        with open(ANALYSIS_CACHE_FILE, 'r') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_analysis_cache(cache):
+    """Write log scan results back next to the results"""
+    try:
+        with open(ANALYSIS_CACHE_FILE, 'w') as f:
+            json.dump(cache, f, indent=2)
+    except OSError as e:
+        print(f"   Could not write analysis cache: {e}")
+
+def get_log_indicators(log_path, st, cache):
+    """Indicator counts for a log, only re-scanning it if it changed since last time"""
+    entry = cache.get(log_path)
+    if entry and entry.get('mtime_ns') == st.st_mtime_ns and entry.get('size') == st.st_size:
+        return Counter(entry.get('counts', {})), False
+    
+    counts = scan_log_indicators(log_path, st.st_size)
+    cache[log_path] = {
+        'mtime_ns': st.st_mtime_ns,
+        'size': st.st_size,
+        'counts': dict(counts)
+    }
+    return counts, True
+
 def analyze_training_logs():
     """Look at training logs to see if multi-drone stuff worked"""
     print("Analyzing Multi-Drone Training Logs...")
     
-    # Look for training results
-    result_dirs = [
-        "results/multi_drone_path_v1",
-        "results/multi_drone_path_v2"
-    ]
+    cache = load_analysis_cache()
+    cache_updated = False
     
-    for result_dir in result_dirs:
-        if not os.path.exists(result_dir):
-            continue
-            
+    # Look for training results
+    for result_dir in find_result_dirs():
         print(f"\nAnalyzing: {result_dir}")
         
         # Check config file
@@ -33,17 +121,13 @@ def analyze_training_logs():
             
         # Check if training actually worked
         agent_dir = os.path.join(result_dir, "DroneAgent")
-        if os.path.exists(agent_dir):
+        agent_found, model_files, tb_files = scan_agent_dir(agent_dir)
+        if agent_found:
             print("DroneAgent training data found")
             
-            # Find model files
-            model_files = []
-            for ext in ['*.onnx', '*.pt']:
-                model_files.extend(glob.glob(os.path.join(agent_dir, ext)))
-            
             if model_files:
                 print(f"   Models: {len(model_files)} files")
-                latest_model = max(model_files, key=os.path.getmtime)
+                latest_model = max(model_files, key=lambda m: m[1])[0]
                 print(f"   Latest model: {os.path.basename(latest_model)}")
                 
                 # Get training steps from filename
@@ -56,40 +140,41 @@ def analyze_training_logs():
                         pass
         
         # Check for TensorBoard logs
-        tb_files = glob.glob(os.path.join(agent_dir, "events.out.tfevents.*"))
         if tb_files:
             print(f"TensorBoard logs: {len(tb_files)} files")
             
         # Check run logs
-        run_logs_dir = os.path.join(result_dir, "run_logs")
-        if os.path.exists(run_logs_dir):
+        log_files = scan_log_files(os.path.join(result_dir, "run_logs"))
+        if log_files is not None:
             print("Run logs directory found")
             
             # Look for training logs
-            log_files = glob.glob(os.path.join(run_logs_dir, "*.log"))
             if log_files:
                 print(f"   Log files: {len(log_files)}")
                 
                 # Try to read the latest log for multi-drone indicators
-                latest_log = max(log_files, key=os.path.getmtime)
+                latest_log, latest_stat = max(log_files, key=lambda l: l[1].st_mtime)
                 try:
-                    with open(latest_log, 'r') as f:
-                        content = f.read()
+                    counts, scanned = get_log_indicators(latest_log, latest_stat, cache)
+                    cache_updated = cache_updated or scanned
+                    
+                    # Look for multi-drone indicators
+                    if counts['agent_0'] or counts['agent_1']:
+                        print("Multi-drone agent names found in logs")
+                        
+                    if counts['agents'] and counts['spawned']:
+                        print("Agent spawning mentioned in logs")
+                        
+                    # Count behavior specs mentioned
+                    behavior_count = counts['behavior_spec']
+                    if behavior_count > 0:
+                        print(f"   Behavior specs mentioned: {behavior_count} times")
                         
-                        # Look for multi-drone indicators
-                        if 'DroneAgent_0' in content or 'DroneAgent_1' in content:
-                            print("Multi-drone agent names found in logs")
-                            
-                        if 'agents' in content.lower() and 'spawned' in content.lower():
-                            print("Agent spawning mentioned in logs")
-                            
-                        # Count behavior specs mentioned
-                        behavior_count = content.count('behavior_spec')
-                        if behavior_count > 0:
-                            print(f"   Behavior specs mentioned: {behavior_count} times")
-                            
                 except Exception as e:
                     print(f"   Could not read log file: {e}")
+    
+    if cache_updated:
+        save_analysis_cache(cache)
 
 def check_recent_training_activity():
     """Check for recent training activity"""
@@ -97,26 +182,23 @@ def check_recent_training_activity():
     
     # Look for recent model files
     all_models = []
-    for result_dir in ["results/multi_drone_path_v1", "results/multi_drone_path_v2"]:
-        if os.path.exists(result_dir):
-            agent_dir = os.path.join(result_dir, "DroneAgent")
-            if os.path.exists(agent_dir):
-                models = glob.glob(os.path.join(agent_dir, "*.onnx"))
-                models.extend(glob.glob(os.path.join(agent_dir, "*.pt")))
-                all_models.extend([(model, result_dir) for model in models])
+    for result_dir in find_result_dirs():
+        agent_dir = os.path.join(result_dir, "DroneAgent")
+        _, models, _ = scan_agent_dir(agent_dir)
+        all_models.extend([(path, mtime, size, result_dir) for path, mtime, size in models])
     
     if all_models:
         # Sort by modification time
-        all_models.sort(key=lambda x: os.path.getmtime(x[0]), reverse=True)
+        all_models.sort(key=lambda x: x[1], reverse=True)
         
         print(f"Found {len(all_models)} model files")
         
         # Show the most recent ones
         print("\nMost Recent Models:")
-        for i, (model_path, result_dir) in enumerate(all_models[:5]):
+        for i, (model_path, mtime, size, result_dir) in enumerate(all_models[:5]):
             filename = os.path.basename(model_path)
-            mod_time = datetime.fromtimestamp(os.path.getmtime(model_path))
-            size_mb = os.path.getsize(model_path) / (1024 * 1024)
+            mod_time = datetime.fromtimestamp(mtime)
+            size_mb = size / (1024 * 1024)
             print(f"   {i+1}. {filename}")
             print(f"      📅 Modified: {mod_time}")
             print(f"      From: {os.path.basename(result_dir)}")
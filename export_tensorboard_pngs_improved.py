@@ -17,15 +17,22 @@ What this does:
 """
 
 import argparse
+import json
 import os
-import re
+import string
+import struct
 import sys
 import math
+import mmap
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
+from itertools import accumulate
 from typing import Dict, List, Tuple, Optional
 
 try:
-    from tensorboard.backend.event_processing.event_accumulator import EventAccumulator
+    from tensorboard.compat.proto import event_pb2
+    from google.protobuf.message import DecodeError
 except Exception as exc:
     print("ERROR: Failed to import tensorboard. Please install it:\n  pip install tensorboard")
     raise
@@ -40,9 +47,29 @@ except Exception:
     print("ERROR: Failed to import matplotlib. Please install it:\n  pip install matplotlib")
     raise
 
+# numba is optional - it just makes the smoothing loops run as native code
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
 # Make plots look nice
 plt.style.use('seaborn-v0_8-whitegrid' if 'seaborn-v0_8-whitegrid' in plt.style.available else 'default')
 
+# Let Agg drop sub-pixel segments and draw long paths in chunks
+matplotlib.rcParams.update({
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+    'agg.path.chunksize': 10000,
+})
+
+# Parsed scalars are cached next to the event files under this name
+TB_CACHE_NAME = ".tb_cache.npz"
+
+# Series longer than this get LTTB-downsampled to ~2 points per pixel before plotting
+LTTB_THRESHOLD = 50000
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Export TensorBoard scalars to publication-ready PNGs")
     parser.add_argument("--run_dir", required=True, help="Path to run dir containing events.out.tfevents.*")
@@ -53,6 +80,13 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--width", type=float, default=10.0, help="Figure width (inches)")
     parser.add_argument("--height", type=float, default=6.0, help="Figure height (inches)")
     parser.add_argument("--csv", action="store_true", help="Also write CSV files")
+    parser.add_argument("--png_compress", type=int, default=1, choices=range(10), metavar="0-9",
+                        help="PNG zlib level: 1 encodes fastest but files are ~50%% larger than 6 "
+                             "(matplotlib default); use 9 for the smallest files")
+    parser.add_argument("--no_cache", action="store_true",
+                        help="Ignore the cached scalars and re-read the event files")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes used to render plots (default/0: one per CPU, 1 = no pool)")
     return parser.parse_args()
 
 def ensure_out_dir(path: str, run_dir: str) -> str:
@@ -61,45 +95,251 @@ def ensure_out_dir(path: str, run_dir: str) -> str:
     os.makedirs(path, exist_ok=True)
     return path
 
+_FILENAME_SAFE = set(string.ascii_letters + string.digits + "_.-")
+
+class _FilenameTable(dict):
+    """str.translate table: safe chars map to themselves, anything else to '_'"""
+    def __missing__(self, code: int) -> str:
+        char = chr(code)
+        self[code] = char if char in _FILENAME_SAFE else "_"
+        return self[code]
+
+_FILENAME_TRANS = _FilenameTable()
+
 def sanitize_filename(name: str) -> str:
-    name = name.replace("/", "__").replace(" ", "_")
-    return re.sub(r"[^A-Za-z0-9_.\-]+", "_", name)
-
-def moving_average(values: List[float], window: int) -> List[float]:
-    if window <= 1 or len(values) < window:
-        return values[:]
-    smoothed = []
-    for i in range(len(values)):
-        start = max(0, i - window + 1)
-        end = i + 1
-        smoothed.append(np.mean(values[start:end]))
-    return smoothed
-
-def exp_smooth(values: List[float], alpha: float) -> List[float]:
-    if not values or alpha <= 0.0:
-        return values[:]
-    smoothed = []
-    last = values[0]
-    smoothed.append(last)
-    for v in values[1:]:
-        last = alpha * last + (1.0 - alpha) * v
-        smoothed.append(last)
-    return smoothed
+    # Every unsafe character becomes its own '_' (the old regex collapsed runs
+    # of them); no ML-Agents tag has such runs, so exported names are unchanged
+    return name.replace("/", "__").translate(_FILENAME_TRANS)
+
+def moving_average(values: List[float], window: int) -> np.ndarray:
+    """Trailing mean over the last `window` points (shorter window at the start)"""
+    arr = np.asarray(values, dtype=np.float64)
+    if window <= 1 or arr.size < window:
+        return arr.copy()
+    ends = np.arange(1, arr.size + 1)
+    starts = np.maximum(0, ends - window)
+    finite = np.isfinite(arr)
+    csum = np.concatenate(([0.0], np.cumsum(np.where(finite, arr, 0.0))))
+    out = (csum[ends] - csum[starts]) / (ends - starts)
+    if not finite.all():
+        # A running sum would carry a nan/inf into every later point; only the
+        # windows that actually hold one get the plain mean (nan/inf as before)
+        bad = np.concatenate(([0], np.cumsum(~finite)))
+        for i in np.flatnonzero(bad[ends] - bad[starts]):
+            out[i] = np.mean(arr[starts[i]:ends[i]])
+    return out
+
+if HAVE_NUMBA:
+    @njit(cache=True, fastmath=True)
+    def _exp_smooth_jit(arr, alpha):
+        out = np.empty_like(arr)
+        out[0] = arr[0]
+        for i in range(1, arr.size):
+            out[i] = alpha * out[i - 1] + (1.0 - alpha) * arr[i]
+        return out
+
+def exp_smooth(values: List[float], alpha: float) -> np.ndarray:
+    arr = np.asarray(values, dtype=np.float64)
+    if arr.size == 0 or alpha <= 0.0:
+        return arr.copy()
+    if HAVE_NUMBA:
+        return _exp_smooth_jit(arr, alpha)
+    beta = 1.0 - alpha
+    return np.fromiter(accumulate(arr.tolist(), lambda last, v: alpha * last + beta * v),
+                       dtype=np.float64, count=arr.size)
+
+if HAVE_NUMBA:
+    @njit(cache=True, fastmath=True)
+    def _smooth_fused_jit(arr, alpha, window):
+        # EMA and trailing mean of the EMA in the same loop
+        n = arr.size
+        ema = np.empty(n)
+        out = np.empty(n)
+        last = arr[0]
+        total = 0.0
+        for i in range(n):
+            if i > 0:
+                last = alpha * last + (1.0 - alpha) * arr[i]
+            ema[i] = last
+            total += last
+            if i >= window:
+                total -= ema[i - window]
+            out[i] = total / min(i + 1, window)
+        return ema, out
+
+def smooth_series(values: List[float], alpha: float, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """EMA of the values, and the series to plot: the EMA run through a
+    trailing moving average when the series is longer than `window`
+    (window <= 1 means no moving average)"""
+    use_moving_avg = window > 1 and len(values) > window
+    if HAVE_NUMBA and use_moving_avg and alpha > 0.0:
+        return _smooth_fused_jit(np.asarray(values, dtype=np.float64), alpha, window)
+    smoothed = exp_smooth(values, alpha)
+    return smoothed, (moving_average(smoothed, window) if use_moving_avg else smoothed)
+
+def read_event_records(path: str):
+    """Yield serialized Event protos from a TFRecord file.
+
+    Each record is: uint64 length, uint32 length crc, payload, uint32 payload crc.
+    The CRCs are skipped (checking them in pure Python is most of what makes
+    EventAccumulator slow) and a truncated last record - training still
+    writing - is ignored. The file is mmap'd and payloads are memoryviews into
+    the mapping, so nothing is read up front or copied per record.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # can't mmap an empty file
+        # Not closed explicitly: the mapping is released once the last
+        # record view handed out is gone
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(buf)
+    offset = 0
+    while offset + 12 <= len(buf):
+        (length,) = struct.unpack_from('<Q', buf, offset)
+        start = offset + 12
+        end = start + length
+        if end + 4 > len(buf):
+            break
+        yield view[start:end]
+        offset = end + 4
+
+def lttb_downsample(x, y, n_out: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Largest-Triangle-Three-Buckets: keep the points that shape the line.
+
+    First and last points are always kept, so the final value is unchanged.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = x.size
+    if n_out < 3 or n_out >= n:
+        return x, y
+    
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < edges.size else n
+        avg_x = x[hi:next_hi].mean()
+        avg_y = y[hi:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return x[keep], y[keep]
+
+def thin_for_plot(steps, values, width: float, dpi: int):
+    """Downsample very long series; short ones are plotted as-is"""
+    if len(steps) <= LTTB_THRESHOLD:
+        return steps, values
+    return lttb_downsample(steps, values, int(2 * width * dpi))
+
+def find_event_files(run_dir: str) -> List[str]:
+    """Event files in the run dir, oldest first"""
+    with os.scandir(run_dir) as it:
+        paths = [entry.path for entry in it
+                 if entry.name.startswith("events.out.tfevents.")
+                 and not entry.name.endswith(".profile-empty")
+                 and entry.is_file()]
+    return sorted(paths)
 
 def load_scalars(run_dir: str) -> Dict[str, Tuple[List[int], List[float]]]:
-    size_guidance = {
-        'scalars': 0, 'histograms': 0, 'images': 0, 'audio': 0,
-        'compressedHistograms': 0, 'tensors': 0,
-    }
-    acc = EventAccumulator(run_dir, size_guidance=size_guidance)
-    acc.Reload()
-    tags = acc.Tags().get('scalars', [])
+    """Read every scalar from the run's event files without EventAccumulator.
+
+    Orphaned data after a restart is dropped the same way TensorBoard does it:
+    a SessionLog.START purges later steps (file_version >= 2), otherwise an
+    out-of-order step purges later steps for the tags it carries.
+    """
     data: Dict[str, Tuple[List[int], List[float]]] = {}
-    for tag in tags:
-        events = acc.Scalars(tag)
-        steps = [e.step for e in events]
-        vals = [float(e.value) for e in events]
-        data[tag] = (steps, vals)
+    file_version = None
+    most_recent_step = -1
+
+    def purge(step: int, tags) -> None:
+        for tag in tags:
+            if tag not in data:
+                continue
+            steps, vals = data[tag]
+            keep = [i for i, s in enumerate(steps) if s < step]
+            if len(keep) != len(steps):
+                data[tag] = ([steps[i] for i in keep], [vals[i] for i in keep])
+
+    for path in find_event_files(run_dir):
+        for record in read_event_records(path):
+            # Without the CRCs a damaged record shows up as a parse error; like
+            # TensorBoard, keep what was read so far and give up on the file
+            try:
+                event = event_pb2.Event.FromString(record)
+            except DecodeError:
+                print(f"Warning: corrupt record in {path}, skipping the rest of the file")
+                break
+
+            if event.HasField("file_version"):
+                try:
+                    file_version = float(event.file_version.split("brain.Event:")[-1])
+                except ValueError:
+                    file_version = -1
+
+            if file_version and file_version >= 2:
+                if event.HasField("session_log") and event.session_log.status == event_pb2.SessionLog.START:
+                    purge(event.step, list(data.keys()))
+            elif event.step < most_recent_step and event.HasField("summary"):
+                purge(event.step, [value.tag for value in event.summary.value])
+            else:
+                most_recent_step = event.step
+
+            if not event.HasField("summary"):
+                continue
+            for value in event.summary.value:
+                if value.HasField("simple_value"):
+                    steps, vals = data.setdefault(value.tag, ([], []))
+                    steps.append(event.step)
+                    vals.append(float(value.simple_value))
+    return data
+
+def event_files_signature(run_dir: str) -> List:
+    """(name, mtime, size) of every event file - changes whenever training writes more"""
+    signature = []
+    for path in find_event_files(run_dir):
+        st = os.stat(path)
+        signature.append([os.path.basename(path), st.st_mtime_ns, st.st_size])
+    return signature
+
+def load_scalars_cached(run_dir: str, use_cache: bool = True) -> Dict[str, Tuple[List[int], List[float]]]:
+    """load_scalars, but reuse the run dir's .tb_cache.npz while the event files are unchanged"""
+    cache_path = os.path.join(run_dir, TB_CACHE_NAME)
+    signature = event_files_signature(run_dir)
+    
+    if use_cache:
+        try:
+            with np.load(cache_path, allow_pickle=False) as cache:
+                if json.loads(str(cache['signature'])) == signature:
+                    return {
+                        tag: (cache[f's{i}'].tolist(), cache[f'v{i}'].tolist())
+                        for i, tag in enumerate(cache['tags'].tolist())
+                    }
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            pass  # missing, truncated or unreadable cache - just reload
+    
+    data = load_scalars(run_dir)
+    
+    arrays = {}
+    for i, (steps, vals) in enumerate(data.values()):
+        arrays[f's{i}'] = np.asarray(steps, dtype=np.int64)
+        arrays[f'v{i}'] = np.asarray(vals, dtype=np.float64)
+    # Write next to the cache and swap it in, so an interrupted save never
+    # leaves a half-written cache behind
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, signature=np.array(json.dumps(signature)),
+                                tags=np.array(list(data.keys()), dtype=str), **arrays)
+        os.replace(tmp_path, cache_path)
+    except OSError as exc:
+        print(f"Warning: could not write scalar cache {cache_path}: {exc}")
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
     return data
 
 def format_steps_axis(x, pos):
@@ -110,110 +350,134 @@ def format_percentage_axis(x, pos):
     """Show as percentage"""
     return f'{x*100:.0f}%'
 
+# Per-tag plot styling, built once. get_plot_config hands out these dicts
+# directly, so callers must treat them as read-only.
+_PLOT_CONFIGS = {
+    'Drone/Success': {
+        'title': 'Success Rate',
+        'ylabel': 'Success Rate (%)',
+        'ylim': (0, 1),
+        'format_y': 'percentage',
+        'color': '#2E8B57',  # Sea green
+        'use_moving_avg': True,
+        'final_marker': True
+    },
+    'Drone/Collisions': {
+        'title': 'Collision Rate',
+        'ylabel': 'Collision Rate (%)',
+        'ylim': (0, None),
+        'format_y': 'percentage',
+        'color': '#DC143C',  # Crimson
+        'use_moving_avg': True,
+        'final_marker': True
+    },
+    'Environment/Cumulative Reward': {
+        'title': 'Cumulative Reward',
+        'ylabel': 'Cumulative Reward',
+        'color': '#4169E1',  # Royal blue
+        'use_moving_avg': True,
+        'final_marker': True
+    },
+    'Drone/EpisodeLength': {
+        'title': 'Episode Length',
+        'ylabel': 'Episode Length (steps)',
+        'color': '#FF8C00',  # Dark orange
+        'use_moving_avg': True
+    },
+    'Drone/MinDistance': {
+        'title': 'Minimum Distance to Goal',
+        'ylabel': 'Min Distance (m)',
+        'color': '#9932CC',  # Dark orchid
+        'use_moving_avg': True
+    },
+    'Policy/Extrinsic Reward': {
+        'title': 'Policy Reward',
+        'ylabel': 'Reward',
+        'color': '#4169E1',
+        'use_moving_avg': True
+    },
+    'Losses/Policy Loss': {
+        'title': 'Policy Loss',
+        'ylabel': 'Loss',
+        'color': '#B22222',  # Fire brick
+        'use_moving_avg': True
+    },
+    'Losses/Value Loss': {
+        'title': 'Value Loss',
+        'ylabel': 'Loss',
+        'color': '#8B0000',  # Dark red
+        'use_moving_avg': True
+    },
+    'Policy/Entropy': {
+        'title': 'Policy Entropy',
+        'ylabel': 'Entropy',
+        'color': '#008B8B',  # Dark cyan
+        'use_moving_avg': True
+    },
+    'Environment/Lesson Number/stage': {
+        'title': 'Curriculum Stage',
+        'ylabel': 'Stage Number',
+        'color': '#9370DB',  # Medium purple
+        'ylim': (0, 10),
+        'use_moving_avg': False
+    }
+}
+
+# Anything not listed above; 'title' is filled in from the tag
+_DEFAULT_CONFIG = {
+    'ylabel': 'Value',
+    'color': '#1f77b4',  # Default matplotlib blue
+    'use_moving_avg': False,
+    'format_y': None,
+    'ylim': None,
+    'final_marker': False
+}
+
 def get_plot_config(tag: str) -> Dict:
     """Get plot-specific configuration"""
-    configs = {
-        'Drone/Success': {
-            'title': 'Success Rate',
-            'ylabel': 'Success Rate (%)',
-            'ylim': (0, 1),
-            'format_y': 'percentage',
-            'color': '#2E8B57',  # Sea green
-            'use_moving_avg': True,
-            'final_marker': True
-        },
-        'Drone/Collisions': {
-            'title': 'Collision Rate',
-            'ylabel': 'Collision Rate (%)',
-            'ylim': (0, None),
-            'format_y': 'percentage',
-            'color': '#DC143C',  # Crimson
-            'use_moving_avg': True,
-            'final_marker': True
-        },
-        'Environment/Cumulative Reward': {
-            'title': 'Cumulative Reward',
-            'ylabel': 'Cumulative Reward',
-            'color': '#4169E1',  # Royal blue
-            'use_moving_avg': True,
-            'final_marker': True
-        },
-        'Drone/EpisodeLength': {
-            'title': 'Episode Length',
-            'ylabel': 'Episode Length (steps)',
-            'color': '#FF8C00',  # Dark orange
-            'use_moving_avg': True
-        },
-        'Drone/MinDistance': {
-            'title': 'Minimum Distance to Goal',
-            'ylabel': 'Min Distance (m)',
-            'color': '#9932CC',  # Dark orchid
-            'use_moving_avg': True
-        },
-        'Policy/Extrinsic Reward': {
-            'title': 'Policy Reward',
-            'ylabel': 'Reward',
-            'color': '#4169E1',
-            'use_moving_avg': True
-        },
-        'Losses/Policy Loss': {
-            'title': 'Policy Loss',
-            'ylabel': 'Loss',
-            'color': '#B22222',  # Fire brick
-            'use_moving_avg': True
-        },
-        'Losses/Value Loss': {
-            'title': 'Value Loss',
-            'ylabel': 'Loss',
-            'color': '#8B0000',  # Dark red
-            'use_moving_avg': True
-        },
-        'Policy/Entropy': {
-            'title': 'Policy Entropy',
-            'ylabel': 'Entropy',
-            'color': '#008B8B',  # Dark cyan
-            'use_moving_avg': True
-        },
-        'Environment/Lesson Number/stage': {
-            'title': 'Curriculum Stage',
-            'ylabel': 'Stage Number',
-            'color': '#9370DB',  # Medium purple
-            'ylim': (0, 10),
-            'use_moving_avg': False
-        }
-    }
-    
-    # Default config
-    default = {
-        'title': tag.replace('/', ' ').replace('_', ' ').title(),
-        'ylabel': 'Value',
-        'color': '#1f77b4',  # Default matplotlib blue
-        'use_moving_avg': False,
-        'format_y': None,
-        'ylim': None,
-        'final_marker': False
-    }
-    
-    return configs.get(tag, default)
+    config = _PLOT_CONFIGS.get(tag)
+    if config is None:
+        config = dict(_DEFAULT_CONFIG, title=tag.replace('/', ' ').replace('_', ' ').title())
+    return config
+
+def save_png(fig, out_png: str, dpi: int, compress_level: int) -> None:
+    """Save with a cheap zlib level - encoding is a big slice of each plot at 300 dpi"""
+    fig.savefig(out_png, dpi=dpi, bbox_inches='tight', facecolor='white',
+                pil_kwargs={'compress_level': compress_level, 'optimize': False})
+
+# Figure/axes reused for every per-tag plot in this process - creating and
+# tearing down a figure per tag costs more than drawing the line itself. Its
+# tick formatters are made once too; they stay tied to this one axes, since
+# matplotlib formatters must not be shared between axes.
+_series_figure = None
+
+def get_series_axes(width: float, height: float, dpi: int):
+    """Cleared figure/axes for the next per-tag plot, with its steps/percentage formatters"""
+    global _series_figure
+    size = (width, height, dpi)
+    if _series_figure is None or _series_figure[2] != size:
+        if _series_figure is not None:
+            plt.close(_series_figure[0])
+        fig, ax = plt.subplots(figsize=(width, height), dpi=dpi, constrained_layout=True)
+        _series_figure = (fig, ax, size, FuncFormatter(format_steps_axis), FuncFormatter(format_percentage_axis))
+    fig, ax, _, steps_fmt, pct_fmt = _series_figure
+    ax.clear()
+    return fig, ax, steps_fmt, pct_fmt
 
-def plot_series_improved(tag: str, steps: List[int], values: List[float], out_png: str,
-                        width: float, height: float, dpi: int, moving_avg_window: int) -> None:
+def plot_series_improved(tag: str, steps: List[int], smoothed_values: List[float], out_png: str,
+                        width: float, height: float, dpi: int, png_compress: int = 1) -> None:
+    """Plot one tag; values come in already smoothed by smooth_series"""
     config = get_plot_config(tag)
     
-    # Apply smoothing
-    if config['use_moving_avg'] and len(values) > moving_avg_window:
-        smoothed_values = moving_average(values, moving_avg_window)
-    else:
-        smoothed_values = values[:]
-    
-    # Create figure with professional styling
-    fig, ax = plt.subplots(figsize=(width, height), dpi=dpi)
+    # Reuse the figure, cleared for this tag
+    fig, ax, steps_fmt, pct_fmt = get_series_axes(width, height, dpi)
     
     # Plot main line
-    ax.plot(steps, smoothed_values, color=config['color'], linewidth=2.5, alpha=0.8)
+    plot_steps, plot_values = thin_for_plot(steps, smoothed_values, width, dpi)
+    ax.plot(plot_steps, plot_values, color=config['color'], linewidth=2.5, alpha=0.8, rasterized=True)
     
     # Add final performance marker
-    if config.get('final_marker', False) and values:
+    if config.get('final_marker', False) and len(smoothed_values):
         final_val = smoothed_values[-1]
         ax.axhline(y=final_val, color=config['color'], linestyle='--', alpha=0.6, linewidth=1.5)
         ax.text(0.02, 0.98, f'Final: {final_val:.1%}' if config.get('format_y') == 'percentage' else f'Final: {final_val:.2f}',
@@ -226,9 +490,9 @@ def plot_series_improved(tag: str, steps: List[int], values: List[float], out_pn
     ax.set_title(config['title'], fontsize=16, fontweight='bold', pad=20)
     
     # Format axes
-    ax.xaxis.set_major_formatter(FuncFormatter(format_steps_axis))
+    ax.xaxis.set_major_formatter(steps_fmt)
     if config.get('format_y') == 'percentage':
-        ax.yaxis.set_major_formatter(FuncFormatter(format_percentage_axis))
+        ax.yaxis.set_major_formatter(pct_fmt)
     
     # Set y-limits if specified
     if config.get('ylim'):
@@ -245,52 +509,47 @@ def plot_series_improved(tag: str, steps: List[int], values: List[float], out_pn
     ax.tick_params(axis='both', which='major', labelsize=12, width=1.5)
     ax.tick_params(axis='both', which='minor', width=1)
     
-    plt.tight_layout()
-    plt.savefig(out_png, dpi=dpi, bbox_inches='tight', facecolor='white')
-    plt.close()
+    save_png(fig, out_png, dpi, png_compress)
+
+def _plot_one(job: Tuple) -> None:
+    """Pool entry point - unpacks one plot_series_improved job"""
+    plot_series_improved(*job)
 
 def create_results_overview(selected_data: List[Tuple[str, List[int], List[float]]], 
-                           out_png: str, dpi: int, moving_avg_window: int) -> None:
-    """Create a 2x2 overview of key results metrics"""
+                           out_png: str, dpi: int, png_compress: int = 1) -> None:
+    """Create a 2x2 overview of key results metrics (values already smoothed)"""
     if len(selected_data) < 4:
         return
     
-    fig, axes = plt.subplots(2, 2, figsize=(15, 10), dpi=dpi)
+    fig, axes = plt.subplots(2, 2, figsize=(15, 10), dpi=dpi, constrained_layout=True)
     axes = axes.flatten()
     
     # Priority order for overview
     priority_tags = ['Drone/Success', 'Drone/Collisions', 'Environment/Cumulative Reward', 'Drone/EpisodeLength']
     
     # Match available data to priority tags
-    plot_data = []
-    for priority_tag in priority_tags:
-        for tag, steps, vals in selected_data:
-            if tag == priority_tag:
-                plot_data.append((tag, steps, vals))
-                break
+    by_tag = {tag: (steps, vals) for tag, steps, vals in selected_data}
+    plot_data = [(tag, *by_tag[tag]) for tag in priority_tags if tag in by_tag]
     
     # Fill remaining slots if needed
-    while len(plot_data) < 4 and len(plot_data) < len(selected_data):
-        for tag, steps, vals in selected_data:
-            if not any(existing_tag == tag for existing_tag, _, _ in plot_data):
-                plot_data.append((tag, steps, vals))
-                break
+    seen = {tag for tag, _, _ in plot_data}
+    for tag, (steps, vals) in by_tag.items():
+        if len(plot_data) >= 4:
+            break
+        if tag not in seen:
+            plot_data.append((tag, steps, vals))
+            seen.add(tag)
     
-    for idx, (tag, steps, vals) in enumerate(plot_data[:4]):
+    for idx, (tag, steps, smoothed_vals) in enumerate(plot_data[:4]):
         ax = axes[idx]
         config = get_plot_config(tag)
         
-        # Apply smoothing
-        if config['use_moving_avg'] and len(vals) > moving_avg_window:
-            smoothed_vals = moving_average(vals, moving_avg_window)
-        else:
-            smoothed_vals = vals[:]
-        
-        # Plot
-        ax.plot(steps, smoothed_vals, color=config['color'], linewidth=2, alpha=0.8)
+        # Plot (each panel is half of the 15in-wide figure)
+        plot_steps, plot_vals = thin_for_plot(steps, smoothed_vals, 15 / 2, dpi)
+        ax.plot(plot_steps, plot_vals, color=config['color'], linewidth=2, alpha=0.8, rasterized=True)
         
         # Final value marker
-        if config.get('final_marker', False) and vals:
+        if config.get('final_marker', False) and len(smoothed_vals):
             final_val = smoothed_vals[-1]
             ax.axhline(y=final_val, color=config['color'], linestyle='--', alpha=0.5, linewidth=1)
         
@@ -310,16 +569,16 @@ def create_results_overview(selected_data: List[Tuple[str, List[int], List[float
         ax.spines['top'].set_visible(False)
         ax.spines['right'].set_visible(False)
     
-    plt.suptitle('Training Results Overview', fontsize=18, fontweight='bold', y=0.98)
-    plt.tight_layout()
-    plt.savefig(out_png, dpi=dpi, bbox_inches='tight', facecolor='white')
-    plt.close()
+    # Leave y unset so constrained layout reserves space for the title
+    fig.suptitle('Training Results Overview', fontsize=18, fontweight='bold')
+    save_png(fig, out_png, dpi, png_compress)
+    plt.close(fig)
 
 def save_csv(path: str, steps: List[int], values: List[float]) -> None:
-    with open(path, 'w', encoding='utf-8') as f:
-        f.write("step,value\n")
-        for s, v in zip(steps, values):
-            f.write(f"{s},{v}\n")
+    # 10 significant digits is well past the float32 precision TensorBoard stores
+    rows = np.column_stack((np.asarray(steps, dtype=np.float64), np.asarray(values, dtype=np.float64)))
+    np.savetxt(path, rows, fmt=['%d', '%.10g'], delimiter=',', header='step,value',
+               comments='', encoding='utf-8')
 
 def main(args: argparse.Namespace) -> None:
     run_dir = os.path.abspath(args.run_dir)
@@ -331,7 +590,7 @@ def main(args: argparse.Namespace) -> None:
     print(f"Reading TensorBoard scalars from: {run_dir}")
     print(f"Writing improved PNGs to: {out_dir}")
 
-    data = load_scalars(run_dir)
+    data = load_scalars_cached(run_dir, use_cache=not args.no_cache)
     if not data:
         print("No scalar tags found.")
         sys.exit(2)
@@ -348,17 +607,19 @@ def main(args: argparse.Namespace) -> None:
     overview_data = []
 
     # Export each tag with improvements
+    plot_jobs = []
     for tag, (steps, vals) in data.items():
         if not steps:
             continue
         
-        # Apply exponential smoothing first
-        smoothed = exp_smooth(vals, args.smoothing)
+        # Exponential smoothing, plus the moving average for noisy metrics
+        window = args.moving_avg if get_plot_config(tag)['use_moving_avg'] else 0
+        smoothed, plotted = smooth_series(vals, args.smoothing, window)
         
-        # Create improved plot
+        # Queue the improved plot (rendered below, possibly in parallel)
         safe = sanitize_filename(tag)
         out_png = os.path.join(out_dir, f"{safe}.png")
-        plot_series_improved(tag, steps, smoothed, out_png, args.width, args.height, args.dpi, args.moving_avg)
+        plot_jobs.append((tag, steps, plotted, out_png, args.width, args.height, args.dpi, args.png_compress))
         
         # Save CSV if requested
         if args.csv:
@@ -367,12 +628,22 @@ def main(args: argparse.Namespace) -> None:
         
         # Collect for overview
         if tag in key_metrics:
-            overview_data.append((tag, steps, smoothed))
+            overview_data.append((tag, steps, plotted))
+
+    # Rendering at high dpi is CPU-bound and independent per tag
+    workers = args.workers or os.cpu_count() or 1
+    if workers <= 1 or len(plot_jobs) < 2:
+        for job in plot_jobs:
+            _plot_one(job)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_plot_one, plot_jobs))
+    plt.close('all')
 
     # Create results overview
     if overview_data:
         overview_png = os.path.join(out_dir, "results_overview.png")
-        create_results_overview(overview_data, overview_png, args.dpi, args.moving_avg)
+        create_results_overview(overview_data, overview_png, args.dpi, args.png_compress)
         print(f"Created results overview: {overview_png}")
 
     print("Export complete with publication-ready formatting!")
@@ -5,12 +5,28 @@ Looks at how performance changes as training gets harder.
 """
 
 import argparse
+import csv
+import io
+import math
 import os
-import pandas as pd
+import warnings
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 import glob
 
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+# One PCG64 generator for all resampling instead of the legacy global RandomState
+_RNG = np.random.default_rng()
+
+# Confidence level of every bootstrap CI, batched or not
+CI_CONFIDENCE = 0.95
+
 def parse_args():
     parser = argparse.ArgumentParser(description="Generate curriculum-aware statistical summary")
     parser.add_argument("--run_dirs", nargs='+', required=True, 
@@ -19,93 +35,243 @@ def parse_args():
                        help="Output file for summary table")
     parser.add_argument("--stage_window", type=int, default=50,
                        help="Number of steps to average within each stage")
+    parser.add_argument("--workers", type=int, default=None,
+                       help="Processes used to read the CSVs once there are enough of them "
+                            "(default: one per CPU, 1 = never use a pool)")
     return parser.parse_args()
 
-def load_csv_data(csv_path: str) -> Tuple[List[int], List[float]]:
-    """Load data from CSV file"""
+def _read_columns_slow(csv_path: str, usecols: Tuple[int, int]) -> np.ndarray:
+    """Row-by-row csv fallback for files loadtxt rejects - blank cells become NaN"""
+    rows = []
+    with open(csv_path, newline='') as f:
+        reader = csv.reader(f)
+        next(reader)
+        for row in reader:
+            if row:
+                rows.append([float(row[i]) if i < len(row) and row[i].strip() else np.nan for i in usecols])
+    return np.array(rows, dtype=np.float64).reshape(-1, 2)
+
+def load_csv_data(csv_path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Load the step and value columns from a CSV file as arrays"""
     try:
-        df = pd.read_csv(csv_path)
-        return df['step'].tolist(), df['value'].tolist()
+        with open(csv_path, newline='') as f:
+            # Pick the columns by name, then let numpy parse the rest of the file
+            header = next(csv.reader(f))
+            usecols = (header.index('step'), header.index('value'))
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', UserWarning)  # header-only file
+                    data = np.loadtxt(f, delimiter=',', quotechar='"', usecols=usecols,
+                                      dtype=np.float64, ndmin=2)
+            except ValueError:
+                data = None  # e.g. a blank cell somewhere in the file
+        if data is None:
+            data = _read_columns_slow(csv_path, usecols)
+        steps = data[:, 0]
+        # Integer steps as before, unless a blank step cell left a NaN in them
+        if np.isfinite(steps).all():
+            steps = steps.astype(np.int64)
+        values = np.ascontiguousarray(data[:, 1])
+        return steps, values
     except Exception as e:
         print(f"Warning: Could not load {csv_path}: {e}")
-        return [], []
+        return np.array([], dtype=np.int64), np.array([], dtype=np.float64)
 
-def find_stage_transitions(stage_steps: List[int], stage_values: List[float]) -> Dict[int, Tuple[int, int]]:
+def find_stage_transitions(stage_steps: np.ndarray, stage_values: np.ndarray) -> Dict[int, Tuple[int, int]]:
     """Figure out when curriculum stages changed"""
-    if not stage_steps or not stage_values:
+    if len(stage_steps) == 0 or len(stage_values) == 0:
         return {}
     
-    stage_ranges = {}
-    current_stage = int(stage_values[0]) if stage_values else 0
-    stage_start = stage_steps[0] if stage_steps else 0
+    steps_arr = np.asarray(stage_steps)
+    stage_arr = np.asarray(stage_values, dtype=np.int64)
     
-    for i, (step, stage_val) in enumerate(zip(stage_steps, stage_values)):
-        stage_num = int(stage_val)
-        
-        # Found a stage change
-        if stage_num != current_stage:
-            # Save the previous stage
-            stage_ranges[current_stage] = (stage_start, stage_steps[i-1] if i > 0 else step)
-            
-            # Start tracking new stage
-            current_stage = stage_num
-            stage_start = step
+    # Indices where the stage changes split the run into constant-stage segments;
+    # each segment ends on the step just before the next change
+    change_idx = np.flatnonzero(np.diff(stage_arr)) + 1
+    starts = np.concatenate(([0], change_idx))
+    ends = np.concatenate((change_idx, [len(stage_arr)])) - 1
     
-    # Save the last stage
-    stage_ranges[current_stage] = (stage_start, stage_steps[-1])
+    stage_ranges = {}
+    for stage_num, start_step, end_step in zip(stage_arr[starts].tolist(), steps_arr[starts], steps_arr[ends]):
+        stage_ranges[stage_num] = (start_step, end_step)
     
     return stage_ranges
 
-def get_stage_performance(steps: List[int], values: List[float], 
-                         stage_ranges: Dict[int, Tuple[int, int]], 
-                         stage_window: int) -> Dict[int, Dict[str, float]]:
-    """Calculate performance metrics for each curriculum stage"""
-    stage_performance = {}
+if HAVE_NUMBA:
+    @njit(cache=True)
+    def _mms(x):
+        # Welford update so mean, std, min and max come out of one pass
+        mn = x[0]
+        mx = x[0]
+        mean = 0.0
+        m2 = 0.0
+        for i in range(x.size):
+            v = x[i]
+            delta = v - mean
+            mean += delta / (i + 1)
+            m2 += delta * (v - mean)
+            if v < mn:
+                mn = v
+            if v > mx:
+                mx = v
+        return mean, math.sqrt(max(m2 / x.size, 0.0)), mn, mx
+
+def segment_stats(x: np.ndarray) -> Tuple[float, float, float, float]:
+    """Mean, std, min and max of a non-empty float array"""
+    if HAVE_NUMBA:
+        return _mms(x)
+    return np.mean(x), np.std(x), np.min(x), np.max(x)
+
+def stage_bounds(steps: np.ndarray, stage_ranges: Dict[int, Tuple[int, int]]) -> Optional[Dict[int, Tuple[int, int]]]:
+    """Index slice (lo, hi) of each stage in a run's step array
+
+    Returns None if the steps are out of order and can't be binary searched.
+    """
+    steps_arr = np.asarray(steps)
+    if np.any(steps_arr[1:] < steps_arr[:-1]):
+        return None
     
-    for stage_num, (start_step, end_step) in stage_ranges.items():
-        # Find values within this stage
-        stage_values = []
-        for step, value in zip(steps, values):
-            if start_step <= step <= end_step:
-                stage_values.append(value)
-        
-        if not stage_values:
+    # Every stage boundary in one searchsorted call per side
+    starts = np.array([start for start, _ in stage_ranges.values()])
+    ends = np.array([end for _, end in stage_ranges.values()])
+    lo = np.searchsorted(steps_arr, starts, 'left')
+    hi = np.searchsorted(steps_arr, ends, 'right')
+    return dict(zip(stage_ranges.keys(), zip(lo.tolist(), hi.tolist())))
+
+def stage_segments(steps: np.ndarray, values: np.ndarray,
+                   stage_ranges: Dict[int, Tuple[int, int]],
+                   bounds: Optional[Dict[int, Tuple[int, int]]] = None) -> Dict[int, np.ndarray]:
+    """Values logged during each stage (views into values when the steps are sorted)
+
+    Pass bounds from stage_bounds to skip the search when they're already known.
+    """
+    steps_arr = np.asarray(steps)
+    values_arr = np.asarray(values, dtype=np.float64)
+    if bounds is None:
+        bounds = stage_bounds(steps_arr, stage_ranges)
+    if bounds is None:
+        return {stage_num: values_arr[(steps_arr >= start_step) & (steps_arr <= end_step)]
+                for stage_num, (start_step, end_step) in stage_ranges.items()}
+    return {stage_num: values_arr[lo:hi] for stage_num, (lo, hi) in bounds.items()}
+
+def stage_final_windows(steps: np.ndarray, values: np.ndarray,
+                        stage_ranges: Dict[int, Tuple[int, int]],
+                        stage_window: int,
+                        bounds: Optional[Dict[int, Tuple[int, int]]] = None) -> Dict[int, Tuple[int, np.ndarray]]:
+    """(n_steps, final stage_window values) of every stage that has data"""
+    windows = {}
+    for stage_num, stage_values in stage_segments(steps, values, stage_ranges, bounds).items():
+        if stage_values.size == 0:
             continue
         
         # Use final portion of stage for "converged" performance
-        if len(stage_values) > stage_window:
-            final_values = stage_values[-stage_window:]
+        if stage_values.size > stage_window:
+            windows[stage_num] = (stage_values.size, stage_values[-stage_window:])
         else:
-            final_values = stage_values
-        
-        if final_values:
-            stage_performance[stage_num] = {
-                'mean': np.mean(final_values),
-                'std': np.std(final_values),
-                'min': np.min(final_values),
-                'max': np.max(final_values),
-                'n_steps': len(stage_values),
-                'step_range': (start_step, end_step)
-            }
-    
+            windows[stage_num] = (stage_values.size, stage_values)
+    return windows
+
+def summarize_stage_windows(windows: Dict[int, Tuple[int, np.ndarray]],
+                            stage_ranges: Dict[int, Tuple[int, int]]) -> Dict[int, Dict[str, float]]:
+    """Performance metrics for each stage from its final window"""
+    stage_performance = {}
+    for stage_num, (n_steps, final_values) in windows.items():
+        mean_val, std_val, min_val, max_val = segment_stats(final_values)
+        stage_performance[stage_num] = {
+            'mean': mean_val,
+            'std': std_val,
+            'min': min_val,
+            'max': max_val,
+            'n_steps': n_steps,
+            'step_range': stage_ranges[stage_num]
+        }
     return stage_performance
 
-def bootstrap_ci(data: List[float], n_bootstrap: int = 1000, confidence: float = 0.95) -> Tuple[float, float]:
-    """Calculate bootstrap confidence interval"""
+def get_stage_performance(steps: np.ndarray, values: np.ndarray, 
+                         stage_ranges: Dict[int, Tuple[int, int]], 
+                         stage_window: int) -> Dict[int, Dict[str, float]]:
+    """Calculate performance metrics for each curriculum stage"""
+    return summarize_stage_windows(stage_final_windows(steps, values, stage_ranges, stage_window), stage_ranges)
+
+if HAVE_NUMBA:
+    @njit(cache=True, fastmath=True)
+    def _boot_means(x, n_bootstrap, rng):
+        # Draw each resample index by index instead of materialising it
+        n = x.size
+        out = np.empty(n_bootstrap)
+        for b in range(n_bootstrap):
+            s = 0.0
+            for _ in range(n):
+                s += x[int(rng.random() * n)]
+            out[b] = s / n
+        return out
+
+def bootstrap_means(data: List[float], n_bootstrap: int = 1000) -> Optional[np.ndarray]:
+    """Means of n_bootstrap resamples of data (None if there are too few points)"""
     if len(data) < 2:
-        return (0.0, 0.0)
+        return None
     
-    bootstrap_means = []
-    for _ in range(n_bootstrap):
-        sample = np.random.choice(data, size=len(data), replace=True)
-        bootstrap_means.append(np.mean(sample))
+    data_arr = np.asarray(data, dtype=np.float64)
+    n = len(data_arr)
+    if HAVE_NUMBA:
+        return _boot_means(data_arr, n_bootstrap, _RNG)
+    # Each row of weights says how often every point was drawn in one resample,
+    # so all bootstrap means come out of a single matrix-vector product
+    weights = _RNG.multinomial(n, np.full(n, 1.0 / n), size=n_bootstrap)
+    return weights @ data_arr / n
+
+def bootstrap_ci(data: List[float], n_bootstrap: int = 1000, confidence: float = CI_CONFIDENCE) -> Tuple[float, float]:
+    """Calculate bootstrap confidence interval"""
+    bootstrap_means_arr = bootstrap_means(data, n_bootstrap)
+    if bootstrap_means_arr is None:
+        return (0.0, 0.0)
     
     alpha = 1 - confidence
-    lower = np.percentile(bootstrap_means, 100 * alpha/2)
-    upper = np.percentile(bootstrap_means, 100 * (1 - alpha/2))
+    lower, upper = np.percentile(bootstrap_means_arr, [100 * alpha/2, 100 * (1 - alpha/2)])
     return (lower, upper)
 
-def analyze_curriculum_aware(run_dirs: List[str], stage_window: int) -> Dict:
+def list_run_files(run_dirs: List[str]) -> Dict[str, set]:
+    """Names of the files in each run dir, from one scandir per dir"""
+    run_files = {}
+    for run_dir in run_dirs:
+        try:
+            with os.scandir(run_dir) as it:
+                run_files[run_dir] = {entry.name for entry in it if entry.is_file()}
+        except OSError:
+            run_files[run_dir] = set()
+    return run_files
+
+# Below this many runs, starting worker processes costs more than parsing
+# the CSVs serially
+POOL_MIN_RUNS = 10
+
+def run_jobs(func, jobs: List, workers: Optional[int] = None) -> List:
+    """map func over the per-run jobs, in a process pool only when there are enough runs"""
+    n_workers = workers or os.cpu_count() or 1
+    if n_workers == 1 or len(jobs) < POOL_MIN_RUNS:
+        return list(map(func, jobs))
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        return list(pool.map(func, jobs))
+
+def _run_stage_performance(job):
+    """metric_key -> (per-stage performance, per-stage final window) for one run"""
+    run_dir, metric_keys, stage_ranges, stage_window = job
+    run_results = {}
+    prev_steps = bounds = None
+    for metric_key in metric_keys:
+        steps, values = load_csv_data(os.path.join(run_dir, f"{metric_key}.csv"))
+        if not (len(steps) and len(values)):
+            continue
+        # Metrics exported together share a step column, and with it the bounds
+        if prev_steps is None or not np.array_equal(steps, prev_steps):
+            bounds = stage_bounds(steps, stage_ranges)
+            prev_steps = steps
+        windows = stage_final_windows(steps, values, stage_ranges, stage_window, bounds)
+        run_results[metric_key] = (summarize_stage_windows(windows, stage_ranges),
+                                   {s: w for s, (_, w) in windows.items()})
+    return run_results
+
+def analyze_curriculum_aware(run_dirs: List[str], stage_window: int, workers: int = None) -> Dict:
     """Analyze performance accounting for curriculum stages"""
     
     # Key metrics to analyze
@@ -118,14 +284,14 @@ def analyze_curriculum_aware(run_dirs: List[str], stage_window: int) -> Dict:
     }
     
     results = {}
+    run_files = list_run_files(run_dirs)
     
     # First, find curriculum stage transitions
     all_stage_ranges = []
     for run_dir in run_dirs:
-        stage_csv = os.path.join(run_dir, "Stage__Current.csv")
-        if os.path.exists(stage_csv):
-            stage_steps, stage_values = load_csv_data(stage_csv)
-            if stage_steps and stage_values:
+        if "Stage__Current.csv" in run_files[run_dir]:
+            stage_steps, stage_values = load_csv_data(os.path.join(run_dir, "Stage__Current.csv"))
+            if len(stage_steps) and len(stage_values):
                 stage_ranges = find_stage_transitions(stage_steps, stage_values)
                 all_stage_ranges.append(stage_ranges)
                 break  # Assume all runs have similar stage progression
@@ -133,11 +299,24 @@ def analyze_curriculum_aware(run_dirs: List[str], stage_window: int) -> Dict:
     if not all_stage_ranges:
         print("Warning: No curriculum stage data found. Using final-window analysis.")
         # Fallback to final window analysis
-        return analyze_final_performance_only(run_dirs, stage_window, metrics)
+        return analyze_final_performance_only(run_dirs, stage_window, metrics, run_files)
     
     stage_ranges = all_stage_ranges[0]  # Use first run's stage structure
     print(f"Found curriculum stages: {sorted(stage_ranges.keys())}")
     
+    # Runs are independent; within a run the metrics share stage bounds
+    jobs = [(run_dir, [mk for mk in metrics if f"{mk}.csv" in run_files[run_dir]], stage_ranges, stage_window)
+            for run_dir in run_dirs]
+    run_stage_perfs = {}
+    run_stage_windows = {}
+    for run_dir, run_results in zip(run_dirs, run_jobs(_run_stage_performance, jobs, workers)):
+        for metric_key, (perf, windows) in run_results.items():
+            run_stage_perfs[run_dir, metric_key] = perf
+            run_stage_windows[run_dir, metric_key] = windows
+    
+    ci_results = []  # stage result dicts still waiting for their CI
+    all_boot_means = []  # matching bootstrap-mean arrays, one per CI
+    
     # Analyze each metric across curriculum stages
     for metric_key, metric_info in metrics.items():
         metric_name = metric_info['name']
@@ -146,19 +325,14 @@ def analyze_curriculum_aware(run_dirs: List[str], stage_window: int) -> Dict:
         stage_performances = {}  # stage_num -> list of performance values across runs
         
         for run_dir in run_dirs:
-            csv_path = os.path.join(run_dir, f"{metric_key}.csv")
-            if os.path.exists(csv_path):
-                steps, values = load_csv_data(csv_path)
-                if steps and values:
-                    run_stage_perf = get_stage_performance(steps, values, stage_ranges, stage_window)
-                    
-                    for stage_num, perf_data in run_stage_perf.items():
-                        if stage_num not in stage_performances:
-                            stage_performances[stage_num] = []
-                        stage_performances[stage_num].append(perf_data['mean'])
+            for stage_num, perf_data in run_stage_perfs.get((run_dir, metric_key), {}).items():
+                if stage_num not in stage_performances:
+                    stage_performances[stage_num] = []
+                stage_performances[stage_num].append(perf_data['mean'])
         
         # Calculate statistics for each stage
         results[metric_name] = {}
+        single_run_windows = run_stage_windows.get((run_dirs[0], metric_key), {})
         for stage_num in sorted(stage_performances.keys()):
             stage_values = stage_performances[stage_num]
             
@@ -166,57 +340,58 @@ def analyze_curriculum_aware(run_dirs: List[str], stage_window: int) -> Dict:
                 mean_val = np.mean(stage_values)
                 std_val = np.std(stage_values) if len(stage_values) > 1 else 0.0
                 
-                # Bootstrap CI
+                # Bootstrap CI (resampled now, percentiles taken for all stages at the end)
+                boot = None
                 if len(stage_values) > 1:
-                    ci_lower, ci_upper = bootstrap_ci(stage_values)
+                    boot = bootstrap_means(stage_values)
                 else:
-                    # For single run, use the stage's internal variability
-                    run_dir = run_dirs[0]
-                    csv_path = os.path.join(run_dir, f"{metric_key}.csv")
-                    steps, values = load_csv_data(csv_path)
-                    if steps and values:
-                        run_stage_perf = get_stage_performance(steps, values, stage_ranges, stage_window)
-                        if stage_num in run_stage_perf:
-                            # Use all values from this stage for CI
-                            stage_start, stage_end = stage_ranges[stage_num]
-                            stage_vals = [v for s, v in zip(steps, values) if stage_start <= s <= stage_end]
-                            if len(stage_vals) > stage_window:
-                                stage_vals = stage_vals[-stage_window:]
-                            ci_lower, ci_upper = bootstrap_ci(stage_vals)
-                        else:
-                            ci_lower, ci_upper = (0.0, 0.0)
-                    else:
-                        ci_lower, ci_upper = (0.0, 0.0)
+                    # For single run, use the variability within the stage's final window
+                    if stage_num in single_run_windows:
+                        boot = bootstrap_means(single_run_windows[stage_num])
                 
-                results[metric_name][stage_num] = {
+                stage_result = {
                     'mean': mean_val,
                     'std': std_val,
-                    'ci_lower': ci_lower,
-                    'ci_upper': ci_upper,
+                    'ci_lower': 0.0,
+                    'ci_upper': 0.0,
                     'format': metric_info['format'],
                     'n_runs': len(stage_values),
                     'step_range': stage_ranges[stage_num]
                 }
+                results[metric_name][stage_num] = stage_result
+                if boot is not None:
+                    ci_results.append(stage_result)
+                    all_boot_means.append(boot)
+    
+    # One K x B percentile call for every CI instead of one call per stage
+    if all_boot_means:
+        alpha = 1 - CI_CONFIDENCE
+        ci_lower, ci_upper = np.percentile(np.stack(all_boot_means), [100 * alpha/2, 100 * (1 - alpha/2)], axis=1)
+        for stage_result, lower, upper in zip(ci_results, ci_lower, ci_upper):
+            stage_result['ci_lower'] = lower
+            stage_result['ci_upper'] = upper
     
     return results
 
-def analyze_final_performance_only(run_dirs: List[str], final_window: int, metrics: Dict) -> Dict:
+def analyze_final_performance_only(run_dirs: List[str], final_window: int, metrics: Dict,
+                                   run_files: Optional[Dict[str, set]] = None) -> Dict:
     """Fallback analysis using final performance only"""
     results = {}
+    if run_files is None:
+        run_files = list_run_files(run_dirs)
     
     for metric_key, metric_info in metrics.items():
         metric_name = metric_info['name']
-        all_final_values = []
+        final_segments = []
         
         for run_dir in run_dirs:
-            csv_path = os.path.join(run_dir, f"{metric_key}.csv")
-            if os.path.exists(csv_path):
-                steps, values = load_csv_data(csv_path)
-                if values:
-                    final_vals = values[-final_window:] if len(values) >= final_window else values
-                    all_final_values.extend(final_vals)
+            if f"{metric_key}.csv" in run_files[run_dir]:
+                steps, values = load_csv_data(os.path.join(run_dir, f"{metric_key}.csv"))
+                if len(values):
+                    final_segments.append(values[-final_window:] if len(values) >= final_window else values)
         
-        if all_final_values:
+        if final_segments:
+            all_final_values = np.concatenate(final_segments)
             mean_val = np.mean(all_final_values)
             std_val = np.std(all_final_values)
             ci_lower, ci_upper = bootstrap_ci(all_final_values)
@@ -232,17 +407,21 @@ def analyze_final_performance_only(run_dirs: List[str], final_window: int, metri
     
     return results
 
-def format_value(value: float, format_type: str) -> str:
-    """Format value according to type"""
-    if format_type == 'percentage':
-        return f"{value*100:.1f}%"
-    elif format_type == 'float':
-        if abs(value) > 100:
-            return f"{value:.0f}"
-        else:
-            return f"{value:.2f}"
+def _format_percentage(value: float) -> str:
+    return f"{value*100:.1f}%"
+
+def _format_float(value: float) -> str:
+    return f"{value:.0f}" if abs(value) > 100 else f"{value:.2f}"
+
+def _format_other(value: float) -> str:
     return f"{value:.3f}"
 
+_FORMATTERS = {'percentage': _format_percentage, 'float': _format_float}
+
+def get_formatter(format_type: str):
+    """Formatting function for a metric's format type"""
+    return _FORMATTERS.get(format_type, _format_other)
+
 def get_stage_description(stage_num: int) -> str:
     """Get human-readable stage description"""
     stage_descriptions = {
@@ -258,14 +437,14 @@ def get_stage_description(stage_num: int) -> str:
 def generate_curriculum_summary(results: Dict, output_file: str, is_curriculum_aware: bool = True):
     """Generate curriculum-aware summary tables"""
     
-    # Text table
-    with open(output_file, 'w') as f:
-        f.write("CURRICULUM-AWARE STATISTICAL SUMMARY\n")
-        f.write("=" * 100 + "\n\n")
+    # Text table, built in memory and written out in one go
+    with io.StringIO() as buf:
+        buf.write("CURRICULUM-AWARE STATISTICAL SUMMARY\n")
+        buf.write("=" * 100 + "\n\n")
         
         if is_curriculum_aware:
-            f.write("Performance metrics analyzed per curriculum stage\n")
-            f.write("(Accounts for increasing environment difficulty)\n\n")
+            buf.write("Performance metrics analyzed per curriculum stage\n")
+            buf.write("(Accounts for increasing environment difficulty)\n\n")
             
             # Per-stage analysis
             if results:
@@ -275,30 +454,35 @@ def generate_curriculum_summary(results: Dict, output_file: str, is_curriculum_a
                     if isinstance(metric_data, dict):
                         all_stages.update(metric_data.keys())
                 
+                # Bind each metric's formatter once rather than per cell
+                formatters = {metric_name: get_formatter(next(iter(metric_data.values()))['format'])
+                              for metric_name, metric_data in results.items() if metric_data}
+                
                 for stage_num in sorted(all_stages):
-                    f.write(f"STAGE {stage_num}: {get_stage_description(stage_num)}\n")
-                    f.write("-" * 80 + "\n")
-                    f.write(f"{'Metric':<25} {'Mean ± Std':<20} {'95% CI':<25} {'N':<5}\n")
-                    f.write("-" * 80 + "\n")
+                    buf.write(f"STAGE {stage_num}: {get_stage_description(stage_num)}\n")
+                    buf.write("-" * 80 + "\n")
+                    buf.write(f"{'Metric':<25} {'Mean ± Std':<20} {'95% CI':<25} {'N':<5}\n")
+                    buf.write("-" * 80 + "\n")
                     
                     for metric_name, metric_data in results.items():
                         if stage_num in metric_data:
                             data = metric_data[stage_num]
-                            mean_str = format_value(data['mean'], data['format'])
-                            std_str = format_value(data['std'], data['format'])
-                            ci_lower_str = format_value(data['ci_lower'], data['format'])
-                            ci_upper_str = format_value(data['ci_upper'], data['format'])
+                            fmt = formatters[metric_name]
+                            mean_str = fmt(data['mean'])
+                            std_str = fmt(data['std'])
+                            ci_lower_str = fmt(data['ci_lower'])
+                            ci_upper_str = fmt(data['ci_upper'])
                             
                             mean_std = f"{mean_str} ± {std_str}"
                             ci_range = f"[{ci_lower_str}, {ci_upper_str}]"
                             
-                            f.write(f"{metric_name:<25} {mean_std:<20} {ci_range:<25} {data['n_runs']:<5}\n")
+                            buf.write(f"{metric_name:<25} {mean_std:<20} {ci_range:<25} {data['n_runs']:<5}\n")
                     
-                    f.write("-" * 80 + "\n\n")
+                    buf.write("-" * 80 + "\n\n")
             
             # Final stage summary (for dissertation table)
-            f.write("FINAL PERFORMANCE SUMMARY (Highest Stage Achieved)\n")
-            f.write("=" * 80 + "\n")
+            buf.write("FINAL PERFORMANCE SUMMARY (Highest Stage Achieved)\n")
+            buf.write("=" * 80 + "\n")
             
             if results:
                 # Find highest stage for each metric
@@ -306,99 +490,102 @@ def generate_curriculum_summary(results: Dict, output_file: str, is_curriculum_a
                 for metric_name, metric_data in results.items():
                     if isinstance(metric_data, dict) and metric_data:
                         highest_stage = max(metric_data.keys())
-                        final_stage_data[metric_name] = metric_data[highest_stage]
+                        final_stage_data[metric_name] = (highest_stage, metric_data[highest_stage])
                 
-                f.write(f"{'Metric':<25} {'Mean ± Std':<20} {'95% CI':<25} {'Stage':<8}\n")
-                f.write("-" * 80 + "\n")
+                buf.write(f"{'Metric':<25} {'Mean ± Std':<20} {'95% CI':<25} {'Stage':<8}\n")
+                buf.write("-" * 80 + "\n")
                 
-                for metric_name, data in final_stage_data.items():
-                    mean_str = format_value(data['mean'], data['format'])
-                    std_str = format_value(data['std'], data['format'])
-                    ci_lower_str = format_value(data['ci_lower'], data['format'])
-                    ci_upper_str = format_value(data['ci_upper'], data['format'])
+                for metric_name, (stage_num, data) in final_stage_data.items():
+                    fmt = get_formatter(data['format'])
+                    mean_str = fmt(data['mean'])
+                    std_str = fmt(data['std'])
+                    ci_lower_str = fmt(data['ci_lower'])
+                    ci_upper_str = fmt(data['ci_upper'])
                     
                     mean_std = f"{mean_str} ± {std_str}"
                     ci_range = f"[{ci_lower_str}, {ci_upper_str}]"
                     
-                    # Find which stage this data came from
-                    stage_num = None
-                    for s_num, s_data in results[metric_name].items():
-                        if s_data == data:
-                            stage_num = s_num
-                            break
-                    
-                    f.write(f"{metric_name:<25} {mean_std:<20} {ci_range:<25} {stage_num:<8}\n")
+                    buf.write(f"{metric_name:<25} {mean_std:<20} {ci_range:<25} {stage_num:<8}\n")
                 
-                f.write("-" * 80 + "\n")
+                buf.write("-" * 80 + "\n")
         else:
-            f.write("Final performance analysis (curriculum stages not detected)\n\n")
+            buf.write("Final performance analysis (curriculum stages not detected)\n\n")
             
-            f.write(f"{'Metric':<25} {'Mean ± Std':<20} {'95% CI':<25} {'N':<5}\n")
-            f.write("-" * 80 + "\n")
+            buf.write(f"{'Metric':<25} {'Mean ± Std':<20} {'95% CI':<25} {'N':<5}\n")
+            buf.write("-" * 80 + "\n")
             
             for metric_name, data in results.items():
-                mean_str = format_value(data['mean'], data['format'])
-                std_str = format_value(data['std'], data['format'])
-                ci_lower_str = format_value(data['ci_lower'], data['format'])
-                ci_upper_str = format_value(data['ci_upper'], data['format'])
+                fmt = get_formatter(data['format'])
+                mean_str = fmt(data['mean'])
+                std_str = fmt(data['std'])
+                ci_lower_str = fmt(data['ci_lower'])
+                ci_upper_str = fmt(data['ci_upper'])
                 
                 mean_std = f"{mean_str} ± {std_str}"
                 ci_range = f"[{ci_lower_str}, {ci_upper_str}]"
                 
-                f.write(f"{metric_name:<25} {mean_std:<20} {ci_range:<25} {data['n_runs']:<5}\n")
+                buf.write(f"{metric_name:<25} {mean_std:<20} {ci_range:<25} {data['n_runs']:<5}\n")
             
-            f.write("-" * 80 + "\n")
+            buf.write("-" * 80 + "\n")
+        
+        with open(output_file, 'w') as f:
+            f.write(buf.getvalue())
 
     # LaTeX table for final performance
     latex_file = output_file.replace('.txt', '_latex.txt')
-    with open(latex_file, 'w') as f:
-        f.write("% Curriculum-aware LaTeX table for dissertation\n")
-        f.write("\\begin{table}[htbp]\n")
-        f.write("\\centering\n")
+    with io.StringIO() as buf:
+        buf.write("% Curriculum-aware LaTeX table for dissertation\n")
+        buf.write("\\begin{table}[htbp]\n")
+        buf.write("\\centering\n")
         
         if is_curriculum_aware:
-            f.write("\\caption{Final Performance Metrics by Highest Curriculum Stage Achieved}\n")
-            f.write("\\label{tab:curriculum_final_performance}\n")
-            f.write("\\begin{tabular}{lcccc}\n")
-            f.write("\\toprule\n")
-            f.write("Metric & Mean ± Std & 95\\% CI & Stage & Description \\\\\n")
-            f.write("\\midrule\n")
+            buf.write("\\caption{Final Performance Metrics by Highest Curriculum Stage Achieved}\n")
+            buf.write("\\label{tab:curriculum_final_performance}\n")
+            buf.write("\\begin{tabular}{lcccc}\n")
+            buf.write("\\toprule\n")
+            buf.write("Metric & Mean ± Std & 95\\% CI & Stage & Description \\\\\n")
+            buf.write("\\midrule\n")
             
             if results:
                 for metric_name, metric_data in results.items():
                     if isinstance(metric_data, dict) and metric_data:
                         highest_stage = max(metric_data.keys())
                         data = metric_data[highest_stage]
+                        fmt = get_formatter(data['format'])
                         
-                        mean_str = format_value(data['mean'], data['format'])
-                        std_str = format_value(data['std'], data['format'])
-                        ci_lower_str = format_value(data['ci_lower'], data['format'])
-                        ci_upper_str = format_value(data['ci_upper'], data['format'])
+                        mean_str = fmt(data['mean'])
+                        std_str = fmt(data['std'])
+                        ci_lower_str = fmt(data['ci_lower'])
+                        ci_upper_str = fmt(data['ci_upper'])
                         stage_desc = get_stage_description(highest_stage)
                         
-                        f.write(f"{metric_name} & {mean_str} ± {std_str} & [{ci_lower_str}, {ci_upper_str}] & {highest_stage} & {stage_desc} \\\\\n")
+                        buf.write(f"{metric_name} & {mean_str} ± {std_str} & [{ci_lower_str}, {ci_upper_str}] & {highest_stage} & {stage_desc} \\\\\n")
         else:
-            f.write("\\caption{Final Performance Metrics}\n")
-            f.write("\\label{tab:final_performance}\n")
-            f.write("\\begin{tabular}{lccc}\n")
-            f.write("\\toprule\n")
-            f.write("Metric & Mean ± Std & 95\\% CI & N \\\\\n")
-            f.write("\\midrule\n")
+            buf.write("\\caption{Final Performance Metrics}\n")
+            buf.write("\\label{tab:final_performance}\n")
+            buf.write("\\begin{tabular}{lccc}\n")
+            buf.write("\\toprule\n")
+            buf.write("Metric & Mean ± Std & 95\\% CI & N \\\\\n")
+            buf.write("\\midrule\n")
             
             for metric_name, data in results.items():
-                mean_str = format_value(data['mean'], data['format'])
-                std_str = format_value(data['std'], data['format'])
-                ci_lower_str = format_value(data['ci_lower'], data['format'])
-                ci_upper_str = format_value(data['ci_upper'], data['format'])
+                fmt = get_formatter(data['format'])
+                mean_str = fmt(data['mean'])
+                std_str = fmt(data['std'])
+                ci_lower_str = fmt(data['ci_lower'])
+                ci_upper_str = fmt(data['ci_upper'])
                 
-                f.write(f"{metric_name} & {mean_str} ± {std_str} & [{ci_lower_str}, {ci_upper_str}] & {data['n_runs']} \\\\\n")
+                buf.write(f"{metric_name} & {mean_str} ± {std_str} & [{ci_lower_str}, {ci_upper_str}] & {data['n_runs']} \\\\\n")
+        
+        buf.write("\\bottomrule\n")
+        buf.write("\\end{tabular}\n")
+        buf.write("\\end{table}\n\n")
         
-        f.write("\\bottomrule\n")
-        f.write("\\end{tabular}\n")
-        f.write("\\end{table}\n\n")
+        buf.write("% Note: Performance measured at convergence within each curriculum stage\n")
+        buf.write("% CI calculated using bootstrap sampling to account for training variability\n")
         
-        f.write("% Note: Performance measured at convergence within each curriculum stage\n")
-        f.write("% CI calculated using bootstrap sampling to account for training variability\n")
+        with open(latex_file, 'w') as f:
+            f.write(buf.getvalue())
 
 def main():
     args = parse_args()
@@ -423,7 +610,7 @@ def main():
         return
     
     # Analyze with curriculum awareness
-    results = analyze_curriculum_aware(valid_dirs, args.stage_window)
+    results = analyze_curriculum_aware(valid_dirs, args.stage_window, args.workers)
     
     if not results:
         print("ERROR: No metrics could be analyzed.")
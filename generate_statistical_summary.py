@@ -5,12 +5,23 @@ Handles both single-run analysis and multi-seed analysis if available.
 """
 
 import argparse
+import csv
 import os
-import pandas as pd
+import warnings
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 from typing import Dict, List, Tuple
 import glob
 
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+# One PCG64 generator for all resampling instead of the legacy global RandomState
+_RNG = np.random.default_rng()
+
 def parse_args():
     parser = argparse.ArgumentParser(description="Generate statistical summary table")
     parser.add_argument("--run_dirs", nargs='+', required=True, 
@@ -19,25 +30,56 @@ def parse_args():
                        help="Output file for summary table")
     parser.add_argument("--final_window", type=int, default=100,
                        help="Number of final steps to average for 'final performance'")
+    parser.add_argument("--workers", type=int, default=None,
+                       help="Processes used to read the CSVs once there are enough of them "
+                            "(default: one per CPU, 1 = never use a pool)")
     return parser.parse_args()
 
-def load_csv_data(csv_path: str) -> Tuple[List[int], List[float]]:
-    """Load step,value data from CSV"""
+def _read_columns_slow(csv_path: str, usecols: Tuple[int, int]) -> np.ndarray:
+    """Row-by-row csv fallback for files loadtxt rejects - blank cells become NaN"""
+    rows = []
+    with open(csv_path, newline='') as f:
+        reader = csv.reader(f)
+        next(reader)
+        for row in reader:
+            if row:
+                rows.append([float(row[i]) if i < len(row) and row[i].strip() else np.nan for i in usecols])
+    return np.array(rows, dtype=np.float64).reshape(-1, 2)
+
+def load_csv_data(csv_path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Load step,value data from CSV as arrays"""
     try:
-        df = pd.read_csv(csv_path)
-        return df['step'].tolist(), df['value'].tolist()
+        with open(csv_path, newline='') as f:
+            # Pick the columns by name, then let numpy parse the rest of the file
+            header = next(csv.reader(f))
+            usecols = (header.index('step'), header.index('value'))
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', UserWarning)  # header-only file
+                    data = np.loadtxt(f, delimiter=',', quotechar='"', usecols=usecols,
+                                      dtype=np.float64, ndmin=2)
+            except ValueError:
+                data = None  # e.g. a blank cell somewhere in the file
+        if data is None:
+            data = _read_columns_slow(csv_path, usecols)
+        steps = data[:, 0]
+        # Integer steps as before, unless a blank step cell left a NaN in them
+        if np.isfinite(steps).all():
+            steps = steps.astype(np.int64)
+        values = np.ascontiguousarray(data[:, 1])
+        return steps, values
     except Exception as e:
         print(f"Warning: Could not load {csv_path}: {e}")
-        return [], []
+        return np.array([], dtype=np.int64), np.array([], dtype=np.float64)
 
-def get_final_performance(values: List[float], window: int) -> Dict[str, float]:
+def get_final_performance(values: np.ndarray, window: int) -> Dict[str, float]:
     """Calculate final performance statistics"""
-    if not values or len(values) < window:
+    if len(values) < window:
         final_vals = values
     else:
         final_vals = values[-window:]
     
-    if not final_vals:
+    if len(final_vals) == 0:
         return {'mean': 0.0, 'std': 0.0, 'min': 0.0, 'max': 0.0}
     
     return {
@@ -47,22 +89,64 @@ def get_final_performance(values: List[float], window: int) -> Dict[str, float]:
         'max': np.max(final_vals)
     }
 
+if HAVE_NUMBA:
+    @njit(cache=True, fastmath=True)
+    def _boot_means(x, n_bootstrap, rng):
+        # Draw each resample index by index instead of materialising it
+        n = x.size
+        out = np.empty(n_bootstrap)
+        for b in range(n_bootstrap):
+            s = 0.0
+            for _ in range(n):
+                s += x[int(rng.random() * n)]
+            out[b] = s / n
+        return out
+
 def bootstrap_ci(data: List[float], n_bootstrap: int = 1000, confidence: float = 0.95) -> Tuple[float, float]:
     """Calculate bootstrap confidence interval"""
     if len(data) < 2:
         return (0.0, 0.0)
     
-    bootstrap_means = []
-    for _ in range(n_bootstrap):
-        sample = np.random.choice(data, size=len(data), replace=True)
-        bootstrap_means.append(np.mean(sample))
+    data_arr = np.asarray(data, dtype=np.float64)
+    n = len(data_arr)
+    if HAVE_NUMBA:
+        bootstrap_means = _boot_means(data_arr, n_bootstrap, _RNG)
+    else:
+        # Each row of weights says how often every point was drawn in one resample,
+        # so all bootstrap means come out of a single matrix-vector product
+        weights = _RNG.multinomial(n, np.full(n, 1.0 / n), size=n_bootstrap)
+        bootstrap_means = weights @ data_arr / n
     
     alpha = 1 - confidence
-    lower = np.percentile(bootstrap_means, 100 * alpha/2)
-    upper = np.percentile(bootstrap_means, 100 * (1 - alpha/2))
+    lower, upper = np.percentile(bootstrap_means, [100 * alpha/2, 100 * (1 - alpha/2)])
     return (lower, upper)
 
-def analyze_runs(run_dirs: List[str], final_window: int) -> Dict:
+# Below this many runs, starting worker processes costs more than parsing
+# the CSVs serially
+POOL_MIN_RUNS = 10
+
+def run_jobs(func, jobs: List, workers: int = None) -> List:
+    """map func over the per-run jobs, in a process pool only when there are enough runs"""
+    n_workers = workers or os.cpu_count() or 1
+    if n_workers == 1 or len(jobs) < POOL_MIN_RUNS:
+        return list(map(func, jobs))
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        return list(pool.map(func, jobs))
+
+def _run_final_windows(job):
+    """metric_key -> (final-window mean, final-window values) for one run"""
+    run_dir, metric_keys, final_window = job
+    run_results = {}
+    for metric_key in metric_keys:
+        csv_path = os.path.join(run_dir, f"{metric_key}.csv")
+        if os.path.exists(csv_path):
+            steps, values = load_csv_data(csv_path)
+            if len(values):
+                final_vals = values[-final_window:] if len(values) >= final_window else values
+                run_results[metric_key] = (get_final_performance(values, final_window)['mean'], final_vals)
+    return run_results
+
+def analyze_runs(run_dirs: List[str], final_window: int, workers: int = None) -> Dict:
     """Analyze one or more training runs"""
     
     # Key metrics to analyze
@@ -76,17 +160,14 @@ def analyze_runs(run_dirs: List[str], final_window: int) -> Dict:
     
     results = {}
     
+    # Runs are independent, so each one is a job
+    jobs = [(run_dir, list(metrics), final_window) for run_dir in run_dirs]
+    run_results = run_jobs(_run_final_windows, jobs, workers)
+    
     for metric_key, metric_info in metrics.items():
         metric_name = metric_info['name']
-        all_final_values = []
-        
-        for run_dir in run_dirs:
-            csv_path = os.path.join(run_dir, f"{metric_key}.csv")
-            if os.path.exists(csv_path):
-                steps, values = load_csv_data(csv_path)
-                if values:
-                    final_stats = get_final_performance(values, final_window)
-                    all_final_values.append(final_stats['mean'])
+        run_windows = [results_for_run.get(metric_key) for results_for_run in run_results]
+        all_final_values = [w[0] for w in run_windows if w is not None]
         
         if all_final_values:
             # Calculate statistics across runs (or single run)
@@ -97,13 +178,9 @@ def analyze_runs(run_dirs: List[str], final_window: int) -> Dict:
             if len(all_final_values) > 1:
                 ci_lower, ci_upper = bootstrap_ci(all_final_values)
             else:
-                # For single run, use the final window for CI
-                run_dir = run_dirs[0]
-                csv_path = os.path.join(run_dir, f"{metric_key}.csv")
-                _, values = load_csv_data(csv_path)
-                if values:
-                    final_vals = values[-final_window:] if len(values) >= final_window else values
-                    ci_lower, ci_upper = bootstrap_ci(final_vals)
+                # For single run, use the first run's final window for CI
+                if run_windows[0] is not None:
+                    ci_lower, ci_upper = bootstrap_ci(run_windows[0][1])
                 else:
                     ci_lower, ci_upper = (0.0, 0.0)
             
@@ -226,7 +303,7 @@ def main():
         return
     
     # Analyze runs
-    results = analyze_runs(valid_dirs, args.final_window)
+    results = analyze_runs(valid_dirs, args.final_window, args.workers)
     
     if not results:
         print("ERROR: No metrics could be analyzed.")